@@ -9,46 +9,94 @@ Template untuk nggawe dataset strategy trading kanthi winrate minimum 70%
 Mung kanggo keperluan edukasi lan riset
 """
 
-!pip install requests tqdm together google-api-python-client google-auth-httplib2 google-auth-oauthlib
+!pip install requests tqdm "httpx[http2]" orjson aiolimiter google-api-python-client google-auth-httplib2 google-auth-oauthlib
 
 import os
+import re
 import time
 import json
+import mmap
+import logging
 import random
+import asyncio
 import hashlib
-import concurrent.futures
+import threading
+import contextvars
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 import uuid
 from datetime import datetime
 
+log = logging.getLogger("ndasqu")
+if not log.handlers:
+    _handler_log = logging.StreamHandler()
+    _handler_log.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    log.addHandler(_handler_log)
+log.setLevel(logging.INFO)
+log.propagate = False
+
 try:
-    from together import Together
+    import httpx
+    from aiolimiter import AsyncLimiter
     from googleapiclient.discovery import build
     from google.oauth2.credentials import Credentials
     from googleapiclient.http import MediaIoBaseUpload
     import io
 except ImportError:
-    print("SALAH: Pustaka ora ketemu. Pastikan wis diinstall kabeh")
+    log.error("Pustaka ora ketemu. Pastikan wis diinstall kabeh")
     raise
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dekode_json(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+def enkode_json(obj: Any, indentasi: bool = True) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indentasi else None)
+    return json.dumps(obj, indent=2 if indentasi else None, ensure_ascii=False).encode('utf-8')
+
 JENENG_MODEL = "meta-llama/Llama-3.3-70B-Instruct-Turbo-Free"
 KUNCI_API = "d3ad95f147eb791d1fe54637a0d8fa2d0795cdb9a2142264f41e10b4a4be9f5b"
+URL_DASAR_API_TOGETHER = "https://api.together.xyz/v1"
+BATES_PANGGILAN_API = 32
 
-try:
+KLIEN = None
+SEMAFOR_API = None
+LIMITER_API = None
+
+def gawe_klien_together() -> httpx.AsyncClient:
     if not KUNCI_API:
         raise ValueError("KUNCI_API kudu diisi.")
-    KLIEN = Together(api_key=KUNCI_API)
-except Exception as e:
-    print(f"SALAH GEDHE: Gagal nggawe klien Together: {e}")
-    raise
+    return httpx.AsyncClient(
+        base_url=URL_DASAR_API_TOGETHER,
+        headers={"Authorization": f"Bearer {KUNCI_API}"},
+        http2=True,
+        timeout=httpx.Timeout(120.0, connect=15.0),
+        limits=httpx.Limits(
+            max_connections=BATES_PANGGILAN_API,
+            max_keepalive_connections=BATES_PANGGILAN_API,
+            keepalive_expiry=60.0
+        )
+    )
 
 UKURAN_DATASET = 100
 UKURAN_BATCH = 15
-JUMLAH_PEKERJA = 3
+JUMLAH_PEKERJA = 10
+JUMLAH_ITEM_PER_PANGGILAN = 5
+MAKS_PANGGILAN_PER_DETIK = 6
 DIREKTORI_OUTPUT = "dataset_strategy_trading_ngapak"
 INTERVAL_CHECKPOINT = 10
+INTERVAL_LOG_MACA = 256
 
 Path(DIREKTORI_OUTPUT).mkdir(exist_ok=True, parents=True)
 
@@ -61,19 +109,19 @@ TEMPLATE_STRATEGY = [
 ]
 
 KOLOM_STRATEGY = {
-    "strategy": [
+    "strategy": (
         "Scalping Price Action", "Moving Average Crossover", "RSI Divergence",
         "Bollinger Bands Squeeze", "Support Resistance Breakout", "Trend Following MACD",
         "Fibonacci Retracement", "Ichimoku Cloud", "Stochastic Oscillator",
         "Volume Profile Trading", "Harmonic Patterns", "Elliott Wave Theory",
         "Supply Demand Zones", "Smart Money Concepts", "Market Structure Analysis"
-    ],
-    "winrate": ["70", "75", "80", "85", "90"],
-    "drawdown": ["5", "8", "10", "12", "15"],
-    "market": ["Forex", "Crypto", "Stock", "Commodities", "Indices"],
-    "timeframe": ["M1", "M5", "M15", "H1", "H4", "D1"],
-    "instrument": ["EURUSD", "GBPUSD", "USDJPY", "BTCUSD", "ETHUSD", "GOLD", "SPX500"],
-    "level": ["Pemula", "Intermediate", "Advanced", "Professional"]
+    ),
+    "winrate": ("70", "75", "80", "85", "90"),
+    "drawdown": ("5", "8", "10", "12", "15"),
+    "market": ("Forex", "Crypto", "Stock", "Commodities", "Indices"),
+    "timeframe": ("M1", "M5", "M15", "H1", "H4", "D1"),
+    "instrument": ("EURUSD", "GBPUSD", "USDJPY", "BTCUSD", "ETHUSD", "GOLD", "SPX500"),
+    "level": ("Pemula", "Intermediate", "Advanced", "Professional")
 }
 
 SKEMA_DATASET = [
@@ -95,23 +143,23 @@ SKEMA_DATASET = [
     }
 ]
 
-def gawe_prompt_variasi() -> (str, str):
-    template = random.choice(TEMPLATE_STRATEGY)
-    skema_pilihan = random.choice(SKEMA_DATASET)
-    
-    placeholder = [kunci for kunci in KOLOM_STRATEGY if f"{{{kunci}}}" in template]
-    for kolom_kunci in placeholder:
-        if KOLOM_STRATEGY[kolom_kunci]:
-            template = template.replace(f"{{{kolom_kunci}}}", random.choice(KOLOM_STRATEGY[kolom_kunci]))
-    
-    deskripsi_skema = f"Gawe ing format JSON kanthi kolom: {', '.join(skema_pilihan['kolom'])}. Jenis data: {skema_pilihan['jenis']}"
-    id_unik = str(uuid.uuid4())
-    
-    prompt_lengkap = f"""Minangka ahli trading strategy, tulung:
+TEMPLATE_STRATEGY_SIAP = tuple(
+    (template, tuple(kunci for kunci in KOLOM_STRATEGY if f"{{{kunci}}}" in template))
+    for template in TEMPLATE_STRATEGY
+)
 
-{template}
+DESKRIPSI_SKEMA = {
+    skema['jenis']: f"Gawe ing format JSON kanthi kolom: {', '.join(skema['kolom'])}. Jenis data: {skema['jenis']}"
+    for skema in SKEMA_DATASET
+}
+
+TEMPLATE_BAGEAN_ITEM = """{nomer}. {template}
+   {deskripsi_skema}
+   Kanggo kolom 'id', gunakno UUID iki: '{id_unik}'. Kolom 'jenis' isi '{jenis}'."""
+
+TEMPLATE_PROMPT = """Minangka ahli trading strategy, tulung gawe {k} strategi ing siji JSON array. Saben elemen array yaiku siji objek JSON, urut miturut daftar iki:
 
-{deskripsi_skema}
+{daftar_item_prompt}
 
 Pastikan:
 - Winrate minimal 70% lan wis teruji ing market nyata
@@ -121,271 +169,407 @@ Pastikan:
 - Backtest hasil sing detailed kanthi periode minimal 1 taun
 - Strategy sing proven ing berbagai kondisi market
 
-Kanggo kolom 'id', gunakno format UUID (contoh: '{id_unik}').
-Hasilno MUNG JSON lengkap tanpa teks tambahan. Ora usah nganggo markdown.
+Hasilno MUNG JSON array lengkap isi {k} objek tanpa teks tambahan. Ora usah nganggo markdown.
 """
-    return prompt_lengkap, skema_pilihan['jenis']
 
-def panggil_api_together(prompt: str, ulang: int = 3) -> Optional[str]:
+AMBANG_PERSENTASE_KOLOM = 0.7
+SKEMA_SAKA_JENIS = {
+    skema['jenis']: (
+        skema,
+        frozenset(skema['kolom']),
+        max(2, int(len(skema['kolom']) * AMBANG_PERSENTASE_KOLOM)),
+        'winrate' in skema['kolom']
+    )
+    for skema in SKEMA_DATASET
+}
+
+WINRATE_VALID = frozenset(
+    [winrate for winrate in KOLOM_STRATEGY["winrate"]]
+    + [f"{winrate}%" for winrate in KOLOM_STRATEGY["winrate"]]
+    + [int(winrate) for winrate in KOLOM_STRATEGY["winrate"]]
+)
+
+_RNG_PEKERJA: contextvars.ContextVar = contextvars.ContextVar("rng_pekerja", default=None)
+
+def rng_pekerja() -> random.Random:
+    rng = _RNG_PEKERJA.get()
+    if rng is None:
+        rng = random.Random()
+        _RNG_PEKERJA.set(rng)
+    return rng
+
+def gawe_prompt_batch(k: int = JUMLAH_ITEM_PER_PANGGILAN) -> (str, List[str]):
+    rng = rng_pekerja()
+    daftar_jenis = []
+    bagean_item = []
+    
+    for nomer in range(1, k + 1):
+        template_mentah, placeholder = rng.choice(TEMPLATE_STRATEGY_SIAP)
+        jenis_skema = rng.choice(SKEMA_DATASET)['jenis']
+        
+        nilai = {kunci: rng.choice(KOLOM_STRATEGY[kunci]) for kunci in placeholder}
+        bagean_item.append(TEMPLATE_BAGEAN_ITEM.format(
+            nomer=nomer,
+            template=template_mentah.format_map(nilai),
+            deskripsi_skema=DESKRIPSI_SKEMA[jenis_skema],
+            id_unik=uuid.uuid4(),
+            jenis=jenis_skema
+        ))
+        daftar_jenis.append(jenis_skema)
+    
+    prompt_lengkap = TEMPLATE_PROMPT.format(k=k, daftar_item_prompt="\n\n".join(bagean_item))
+    return prompt_lengkap, daftar_jenis
+
+async def panggil_api_together(prompt: str, ulang: int = 3, max_tokens: int = 4000) -> Optional[bytes]:
     global KLIEN, JENENG_MODEL
     if not KLIEN:
-        print("SALAH: Klien Together durung diinisialisasi.")
+        log.error("Klien Together durung diinisialisasi.")
         return None
     
     pesen = [
-        {"role": "system", "content": "Sampeyan ahli trading strategy sing berpengalaman. Gawe data JSON sing akurat lan detail. Output MUNG objek JSON. Ora usah nganggo markdown."},
+        {"role": "system", "content": "Sampeyan ahli trading strategy sing berpengalaman. Gawe data JSON sing akurat lan detail. Output MUNG JSON array saka objek-objek JSON. Ora usah nganggo markdown."},
         {"role": "user", "content": prompt}
     ]
     
     for nyoba in range(ulang):
         try:
-            print(f"    DEBUG: Nyoba panggil API (nyoba {nyoba+1}/{ulang}) kanthi model {JENENG_MODEL}")
-            respon_stream = KLIEN.chat.completions.create(
-                model=JENENG_MODEL,
-                messages=pesen,
-                max_tokens=4000,
-                temperature=0.3,
-                top_p=0.85,
-                stream=True
-            )
+            log.debug("Nyoba panggil API (nyoba %s/%s) kanthi model %s", nyoba+1, ulang, JENENG_MODEL)
+            payload = {
+                "model": JENENG_MODEL,
+                "messages": pesen,
+                "max_tokens": max_tokens,
+                "temperature": 0.3,
+                "top_p": 0.85,
+                "stream": True
+            }
             
-            konten_akumulasi = []
-            for chunk in respon_stream:
-                if hasattr(chunk, 'choices') and chunk.choices:
-                    delta_konten = chunk.choices[0].delta.content
-                    if delta_konten:
-                        konten_akumulasi.append(delta_konten)
+            konten_akumulasi = bytearray()
+            async with SEMAFOR_API:
+                await LIMITER_API.acquire()
+                async with KLIEN.stream("POST", "/chat/completions", json=payload) as respon_stream:
+                    respon_stream.raise_for_status()
+                    stream_rampung = False
+                    async for baris in respon_stream.aiter_lines():
+                        if stream_rampung or not baris.startswith("data:"):
+                            continue
+                        data_baris = baris[5:].strip()
+                        if data_baris == "[DONE]":
+                            stream_rampung = True
+                            continue
+                        chunk = dekode_json(data_baris)
+                        if chunk.get('choices'):
+                            delta_konten = chunk['choices'][0].get('delta', {}).get('content')
+                            if delta_konten:
+                                konten_akumulasi.extend(delta_konten.encode('utf-8'))
             
-            respon_lengkap = "".join(konten_akumulasi)
+            respon_lengkap = bytes(konten_akumulasi)
             if not respon_lengkap.strip():
-                print(f"    PERINGATAN: API panggilan {nyoba+1} ngasilno respon kosong.")
+                log.warning("API panggilan %s ngasilno respon kosong.", nyoba+1)
                 if nyoba < ulang - 1:
-                    time.sleep(5 * (nyoba + 1))
+                    await asyncio.sleep(5 * (nyoba + 1))
                     continue
                 else:
                     return None
             
-            print(f"    DEBUG: API panggilan sukses. Respon (awal): {respon_lengkap[:100]}...")
+            log.debug("API panggilan sukses. Respon (awal): %r...", respon_lengkap[:100])
             return respon_lengkap
             
         except Exception as e:
-            print(f"    SALAH: API panggilan {nyoba+1} gagal: {type(e).__name__} - {str(e)}")
-            if "authentication" in str(e).lower() or "api key" in str(e).lower():
-                print("    SALAH KRITIS: Masalah otentikasi. Proses dihentikan.")
+            log.error("API panggilan %s gagal: %s - %s", nyoba+1, type(e).__name__, e)
+            kode_status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            if kode_status in (401, 403) or "authentication" in str(e).lower() or "api key" in str(e).lower():
+                log.critical("Masalah otentikasi. Proses dihentikan.")
                 raise ConnectionAbortedError(f"Authentication error: {e}") from e
             
             if nyoba < ulang - 1:
-                print(f"    Nyoba maneh ing {10 * (nyoba + 1)} detik...")
-                time.sleep(10 * (nyoba + 1))
+                log.info("Nyoba maneh ing %s detik...", 10 * (nyoba + 1))
+                await asyncio.sleep(10 * (nyoba + 1))
             else:
-                print("    SALAH KRITIS: Kabeh nyoba API gagal.")
+                log.critical("Kabeh nyoba API gagal.")
                 return None
     return None
 
-def ekstrak_json_saka_string(string_json: str) -> Optional[Dict[str, Any]]:
-    if not string_json or not isinstance(string_json, str):
-        print("DEBUG: Input string kosong utawa dudu string.")
+_CODEFENCE_RE = re.compile(rb'^```(?:json)?\s*\n|\n\s*```$')
+
+def daftar_objek_saka_json(json_parsed: Any) -> List[Dict[str, Any]]:
+    if isinstance(json_parsed, dict):
+        return [json_parsed]
+    if isinstance(json_parsed, list):
+        return [objek for objek in json_parsed if isinstance(objek, dict)]
+    log.debug("Hasil parse dudu objek utawa array JSON.")
+    return []
+
+def ekstrak_json_saka_string(string_json: Union[str, bytes]) -> Optional[List[Dict[str, Any]]]:
+    if isinstance(string_json, str):
+        string_json = string_json.encode('utf-8')
+    if not string_json or not isinstance(string_json, bytes):
+        log.debug("Input kosong utawa dudu string/bytes.")
         return None
     
-    konten_teks = string_json.strip()
+    konten_teks = _CODEFENCE_RE.sub(b'', string_json.strip())
     
-    indeks_mulai = konten_teks.find('{')
-    indeks_pungkas = konten_teks.rfind('}')
-    
-    if indeks_mulai != -1 and indeks_pungkas != -1 and indeks_pungkas > indeks_mulai:
-        json_potensial = konten_teks[indeks_mulai : indeks_pungkas + 1]
-        try:
-            json_parsed = json.loads(json_potensial)
-            if 'id' not in json_parsed or not json_parsed.get('id'):
-                json_parsed['id'] = str(uuid.uuid4())
-                print("DEBUG: Nambah UUID amarga 'id' ora ana.")
-            return json_parsed
-        except json.JSONDecodeError as e:
-            print(f"DEBUG: Gagal decode JSON: {e}")
+    try:
+        daftar_objek = daftar_objek_saka_json(dekode_json(konten_teks))
+    except json.JSONDecodeError as e:
+        log.debug("Gagal decode JSON langsung: %s", e)
+        daftar_objek = []
+        potongan = sorted(
+            (konten_teks.find(tandha_mulai), tandha_mulai, tandha_pungkas)
+            for tandha_mulai, tandha_pungkas in ((b'[', b']'), (b'{', b'}'))
+            if tandha_mulai in konten_teks
+        )
+        for indeks_mulai, tandha_mulai, tandha_pungkas in potongan:
+            indeks_pungkas = konten_teks.rfind(tandha_pungkas)
+            if indeks_pungkas <= indeks_mulai:
+                continue
             try:
-                json_parsed_full = json.loads(konten_teks)
-                if 'id' not in json_parsed_full or not json_parsed_full.get('id'):
-                    json_parsed_full['id'] = str(uuid.uuid4())
-                return json_parsed_full
+                daftar_objek = daftar_objek_saka_json(dekode_json(konten_teks[indeks_mulai : indeks_pungkas + 1]))
             except json.JSONDecodeError:
-                print(f"DEBUG: Gagal parse kabeh string.")
-                return None
-    return None
+                log.debug("Gagal parse potongan JSON %s...%s.", tandha_mulai.decode(), tandha_pungkas.decode())
+                continue
+            if daftar_objek:
+                break
+        if not daftar_objek:
+            return None
+    
+    for objek in daftar_objek:
+        if not objek.get('id'):
+            objek['id'] = str(uuid.uuid4())
+            log.debug("Nambah UUID amarga 'id' ora ana.")
+    return daftar_objek
 
 def validasi_data(data: Dict[str, Any], jenis_skema: str) -> bool:
     if not data or not isinstance(data, dict):
-        print(f"DEBUG: Data kosong utawa dudu dictionary.")
+        log.debug("Data kosong utawa dudu dictionary.")
         return False
     
-    skema_saiki = next((s for s in SKEMA_DATASET if s['jenis'] == jenis_skema), None)
-    if not skema_saiki:
-        print(f"DEBUG: Ora ketemu skema kanggo jenis: {jenis_skema}")
+    info_skema = SKEMA_SAKA_JENIS.get(jenis_skema)
+    if not info_skema:
+        log.debug("Ora ketemu skema kanggo jenis: %s", jenis_skema)
         return False
+    skema_saiki, kolom_perlu, minimal_kolom, ana_winrate = info_skema
     
     if 'id' not in data or not data['id']:
-        print(f"DEBUG: Data ora valid: kolom 'id' ilang.")
+        log.debug("Data ora valid: kolom 'id' ilang.")
         return False
     
-    kolom_perlu = skema_saiki['kolom']
-    kolom_ana = sum(1 for kolom in kolom_perlu if kolom in data and data[kolom] is not None)
-    ambang_persentase = 0.7
-    minimal_kolom = max(2, int(len(kolom_perlu) * ambang_persentase))
+    kolom_ana = sum(1 for kolom in kolom_perlu if data.get(kolom) is not None)
     
     if kolom_ana < minimal_kolom:
-        print(f"DEBUG: Data ora valid: Kurang saka {minimal_kolom} kolom kanggo skema {skema_saiki['jenis']}.")
+        log.debug("Data ora valid: Kurang saka %s kolom kanggo skema %s.", minimal_kolom, skema_saiki['jenis'])
         return False
     
-    if 'winrate' in data:
+    winrate = data.get('winrate') if ana_winrate else None
+    if winrate is not None and not (isinstance(winrate, (str, int, float)) and winrate in WINRATE_VALID):
         try:
-            winrate_nilai = float(str(data['winrate']).replace('%', ''))
+            winrate_nilai = float(str(winrate).replace('%', ''))
             if winrate_nilai < 70:
-                print(f"DEBUG: Winrate {winrate_nilai}% kurang saka minimal 70%.")
+                log.debug("Winrate %s%% kurang saka minimal 70%%.", winrate_nilai)
                 return False
-        except:
-            print(f"DEBUG: Winrate ora bisa dikonversi dadi angka.")
+        except (ValueError, TypeError):
+            log.debug("Winrate ora bisa dikonversi dadi angka.")
     
-    print(f"DEBUG: Data valid kanggo skema '{jenis_skema}'.")
+    log.debug("Data valid kanggo skema '%s'.", jenis_skema)
     return True
 
-def gawe_item_tunggal() -> Optional[Dict[str, Any]]:
-    prompt, jenis_skema = gawe_prompt_variasi()
-    print(f"  DEBUG: Nggawe item kanthi skema: {jenis_skema}")
+_CACHE_TANGGAL = [0, '']
+
+def tanggal_saiki() -> str:
+    detik_saiki = int(time.time())
+    if detik_saiki != _CACHE_TANGGAL[0]:
+        _CACHE_TANGGAL[0] = detik_saiki
+        _CACHE_TANGGAL[1] = datetime.fromtimestamp(detik_saiki).isoformat()
+    return _CACHE_TANGGAL[1]
+
+async def gawe_item_batch(k: int = JUMLAH_ITEM_PER_PANGGILAN) -> List[Dict[str, Any]]:
+    prompt, daftar_jenis = gawe_prompt_batch(k)
+    log.debug("Nggawe %s item kanthi skema: %s", k, daftar_jenis)
     
-    respon_string = panggil_api_together(prompt)
+    respon_string = await panggil_api_together(prompt, max_tokens=4000 * k)
     if not respon_string:
-        print(f"  SALAH: Gagal entuk respon saka API.")
-        return None
-    
-    data_ekstrak = ekstrak_json_saka_string(respon_string)
-    if data_ekstrak and validasi_data(data_ekstrak, jenis_skema):
-        if 'jenis' not in data_ekstrak:
-            data_ekstrak['jenis'] = jenis_skema
+        log.error("Gagal entuk respon saka API.")
+        return []
+    
+    daftar_ekstrak = ekstrak_json_saka_string(respon_string)
+    if not daftar_ekstrak:
+        log.error("Respon gagal diekstrak dadi JSON.")
+        return []
+    
+    item_valid = []
+    for nomer, data_ekstrak in enumerate(daftar_ekstrak[:k]):
+        jenis_skema = data_ekstrak.get('jenis')
+        if not isinstance(jenis_skema, str) or jenis_skema not in SKEMA_SAKA_JENIS:
+            jenis_skema = daftar_jenis[nomer]
         
-        data_ekstrak['tanggal_dibuat'] = datetime.now().isoformat()
+        if not validasi_data(data_ekstrak, jenis_skema):
+            log.error("Item %s gagal divalidasi.", nomer + 1)
+            continue
+        
+        data_ekstrak['jenis'] = jenis_skema
+        data_ekstrak['tanggal_dibuat'] = tanggal_saiki()
         data_ekstrak['status_verifikasi'] = 'belum_diverifikasi'
         
-        print(f"  INFO: Item sukses digawe (ID: {data_ekstrak.get('id', 'N/A')}).")
-        return data_ekstrak
-    else:
-        print(f"  SALAH: Item gagal diekstrak utawa divalidasi.")
-        return None
+        log.info("Item sukses digawe (ID: %s).", data_ekstrak.get('id', 'N/A'))
+        item_valid.append(data_ekstrak)
+    
+    return item_valid
+
+def simpen_batch_pekerja(direktori_pekerja: Path, id_pekerja: int, nomer_sesi: int, item_disimpen: List[Dict[str, Any]]) -> bool:
+    timestamp = int(time.time())
+    jeneng_file = direktori_pekerja / f"batch_{nomer_sesi}_{timestamp}.json"
+    try:
+        with open(jeneng_file, 'wb') as f:
+            f.write(enkode_json(item_disimpen))
+        log.info("Pekerja %s: Nyimpen %s item menyang %s.", id_pekerja, len(item_disimpen), jeneng_file)
+        return True
+    except Exception as e:
+        log.error("Pekerja %s - Gagal nyimpen batch: %s", id_pekerja, e)
+        return False
 
-def pekerja_gawe_data(id_pekerja: int, total_item: int, _: int) -> List[Dict[str, Any]]:
+async def pekerja_gawe_data(id_pekerja: int, total_item: int, _: int, akumulasi: Optional[List[Dict[str, Any]]] = None) -> int:
     direktori_pekerja = Path(DIREKTORI_OUTPUT) / f"pekerja_{id_pekerja}"
     direktori_pekerja.mkdir(exist_ok=True, parents=True)
+    _RNG_PEKERJA.set(random.Random())
     
-    daftar_item = []
-    item_diproses = 0
+    item_pending = []
+    total_rampung = 0
     nomer_sesi = 0
     
-    print(f"INFO: Pekerja {id_pekerja}: Mulai. Target: {total_item} item.")
+    log.info("Pekerja %s: Mulai. Target: %s item.", id_pekerja, total_item)
     
-    while len(daftar_item) < total_item:
+    while total_rampung < total_item:
         nomer_sesi += 1
-        print(f"  INFO: Pekerja {id_pekerja}, Sesi {nomer_sesi}, Item ke-{len(daftar_item) + 1}:")
+        log.info("Pekerja %s, Sesi %s, Item ke-%s:", id_pekerja, nomer_sesi, total_rampung + 1)
         
         try:
-            item = gawe_item_tunggal()
-            if item:
-                daftar_item.append(item)
-                item_diproses += 1
+            jumlah_dijaluk = min(JUMLAH_ITEM_PER_PANGGILAN, total_item - total_rampung)
+            daftar_item_anyar = await gawe_item_batch(jumlah_dijaluk)
+            if daftar_item_anyar:
+                item_pending.extend(daftar_item_anyar)
+                total_rampung += len(daftar_item_anyar)
+                if akumulasi is not None:
+                    akumulasi.extend(daftar_item_anyar)
                 
-                if item_diproses % UKURAN_BATCH == 0 or len(daftar_item) == total_item:
-                    timestamp = int(time.time())
-                    indeks_mulai = max(0, len(daftar_item) - item_diproses)
-                    item_disimpen = daftar_item[indeks_mulai:]
-                    
-                    if item_disimpen:
-                        jeneng_file = direktori_pekerja / f"batch_{nomer_sesi}_{timestamp}.json"
-                        try:
-                            with open(jeneng_file, 'w', encoding='utf-8') as f:
-                                json.dump(item_disimpen, f, indent=2, ensure_ascii=False)
-                            print(f"INFO: Pekerja {id_pekerja}: Nyimpen {len(item_disimpen)} item menyang {jeneng_file}.")
-                            item_diproses = 0
-                        except Exception as e:
-                            print(f"SALAH: Pekerja {id_pekerja} - Gagal nyimpen batch: {e}")
+                if len(item_pending) >= UKURAN_BATCH or total_rampung == total_item:
+                    if simpen_batch_pekerja(direktori_pekerja, id_pekerja, nomer_sesi, item_pending):
+                        item_pending.clear()
             else:
-                print(f"  PERINGATAN: Pekerja {id_pekerja} - Gagal nggawe item valid.")
-            
-            time.sleep(3.0 + random.uniform(0, 2))
+                log.warning("Pekerja %s - Gagal nggawe item valid.", id_pekerja)
             
         except ConnectionAbortedError as e:
-            print(f"  SALAH KRITIS ing Pekerja {id_pekerja}: {e}. Mandheg.")
+            log.critical("Pekerja %s: %s. Mandheg.", id_pekerja, e)
             break
         except Exception as e:
-            print(f"  SALAH: Pekerja {id_pekerja} - Exception: {e}. Terus sawise jeda.")
-            time.sleep(8)
+            log.error("Pekerja %s - Exception: %s. Terus sawise jeda.", id_pekerja, e)
+            await asyncio.sleep(8)
     
-    print(f"INFO: Pekerja {id_pekerja}: Rampung. Total item: {len(daftar_item)}")
-    return daftar_item
+    if item_pending:
+        simpen_batch_pekerja(direktori_pekerja, id_pekerja, nomer_sesi, item_pending)
+    
+    log.info("Pekerja %s: Rampung. Total item: %s", id_pekerja, total_rampung)
+    return total_rampung
+
+def golek_file_batch(direktori_output: str) -> List[str]:
+    file_json = []
+    with os.scandir(direktori_output) as isi_output:
+        for direktori_pekerja in isi_output:
+            if not (direktori_pekerja.name.startswith("pekerja_") and direktori_pekerja.is_dir()):
+                continue
+            with os.scandir(direktori_pekerja.path) as isi_pekerja:
+                for entri_file in isi_pekerja:
+                    if entri_file.name.endswith(".json") and entri_file.is_file():
+                        file_json.append(entri_file.path)
+    return file_json
+
+def maca_file_batch(jalur_file: str) -> Optional[Any]:
+    try:
+        with open(jalur_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as peta_file, memoryview(peta_file) as konten:
+                return dekode_json(konten)
+    except Exception as e:
+        log.error("Gagal maca file %s: %s. Dilewati.", jalur_file, e)
+        return None
 
-def gabung_file_data():
+def gabung_file_data(kabeh_data: Optional[List[Dict[str, Any]]] = None):
     print("\n" + "="*30 + " Nggabung File Data " + "="*30)
-    kabeh_data = []
     jalur_output = Path(DIREKTORI_OUTPUT)
-    file_json = list(jalur_output.glob("pekerja_*/*.json"))
-    
-    if not file_json:
-        print("INFO: Ora ana file JSON kanggo digabung.")
-        jalur_kosong = jalur_output / f"dataset_strategy_trading_kosong_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        try:
-            with open(jalur_kosong, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=2, ensure_ascii=False)
-            print(f"INFO: File kosong digawe ing: {jalur_kosong}")
-        except Exception as e:
-            print(f"SALAH: Gagal nggawe file kosong: {e}")
-        return [], jalur_kosong
     
-    print(f"INFO: Ketemu {len(file_json)} file JSON kanggo digabung.")
-    for jalur_file in tqdm(file_json, desc="Maca file JSON pekerja"):
-        try:
-            with open(jalur_file, 'r', encoding='utf-8') as f:
-                konten = f.read()
-                if not konten.strip():
+    if kabeh_data is not None:
+        log.info("Nggunakno %s item saka memori, file batch ora diwaca maneh.", len(kabeh_data))
+    else:
+        kabeh_data = []
+        file_json = golek_file_batch(DIREKTORI_OUTPUT)
+        
+        if not file_json:
+            log.info("Ora ana file JSON kanggo digabung.")
+            jalur_kosong = jalur_output / f"dataset_strategy_trading_kosong_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            try:
+                with open(jalur_kosong, 'wb') as f:
+                    f.write(enkode_json([]))
+                log.info("File kosong digawe ing: %s", jalur_kosong)
+            except Exception as e:
+                log.error("Gagal nggawe file kosong: %s", e)
+            return [], jalur_kosong
+        
+        log.info("Ketemu %s file JSON kanggo digabung.", len(file_json))
+        with ThreadPoolExecutor(max_workers=min(32, len(file_json))) as executor:
+            for nomer, data_batch in enumerate(executor.map(maca_file_batch, file_json), 1):
+                if nomer % INTERVAL_LOG_MACA == 0:
+                    log.info("Maca file JSON pekerja: %s/%s", nomer, len(file_json))
+                if data_batch is None:
                     continue
-                data_batch = json.loads(konten)
                 if isinstance(data_batch, list):
                     kabeh_data.extend(data_batch)
                 elif isinstance(data_batch, dict):
                     kabeh_data.append(data_batch)
-        except Exception as e:
-            print(f"SALAH: Gagal maca file {jalur_file}: {e}. Dilewati.")
     
     if not kabeh_data:
-        print("INFO: Ora ana data sing bisa dimaca saka file JSON.")
+        log.info("Ora ana data sing bisa dimaca saka file JSON.")
         jalur_kosong = jalur_output / f"dataset_strategy_trading_kosong_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         try:
-            with open(jalur_kosong, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=2, ensure_ascii=False)
-            print(f"INFO: File kosong digawe ing: {jalur_kosong}")
+            with open(jalur_kosong, 'wb') as f:
+                f.write(enkode_json([]))
+            log.info("File kosong digawe ing: %s", jalur_kosong)
         except Exception as e:
-            print(f"SALAH: Gagal nggawe file kosong: {e}")
+            log.error("Gagal nggawe file kosong: %s", e)
         return [], jalur_kosong
     
-    print(f"INFO: Total data sadurunge deduplikasi: {len(kabeh_data)}")
-    data_unik = {}
+    log.info("Total data sadurunge deduplikasi: %s", len(kabeh_data))
+    id_wis_ana = set()
+    daftar_data_final = []
     for item in kabeh_data:
-        if isinstance(item, dict) and 'id' in item and item['id']:
-            data_unik[item['id']] = item
+        if isinstance(item, dict):
+            id_item = item.get('id')
+            if id_item and id_item not in id_wis_ana:
+                id_wis_ana.add(id_item)
+                daftar_data_final.append(item)
+    kabeh_data.clear()
+    del id_wis_ana
     
-    daftar_data_final = list(data_unik.values())
-    print(f"INFO: Total data unik sawise deduplikasi: {len(daftar_data_final)}")
+    log.info("Total data unik sawise deduplikasi: %s", len(daftar_data_final))
     
     jalur_output_final = jalur_output / f"dataset_strategy_trading_final_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     try:
-        with open(jalur_output_final, 'w', encoding='utf-8') as f:
-            json.dump(daftar_data_final, f, indent=2, ensure_ascii=False)
-        print(f"INFO: Dataset final ({len(daftar_data_final)} item) disimpen ing: {jalur_output_final}")
+        with open(jalur_output_final, 'wb') as f:
+            f.write(b'[\n')
+            for nomer, item in enumerate(daftar_data_final):
+                if nomer:
+                    f.write(b',\n')
+                f.write(enkode_json(item, indentasi=False))
+            f.write(b'\n]')
+        log.info("Dataset final (%s item) disimpen ing: %s", len(daftar_data_final), jalur_output_final)
     except Exception as e:
-        print(f"SALAH: Gagal nyimpen dataset final: {e}")
+        log.error("Gagal nyimpen dataset final: %s", e)
     
     print("="*30 + " Penggabungan Rampung " + "="*30 + "\n")
     return daftar_data_final, jalur_output_final
 
 def upload_menyang_googledrive(jalur_file: str):
     try:
-        print("INFO: Nyoba upload menyang Google Drive...")
-        print("PERINGATAN: Fitur Google Drive upload butuh konfigurasi OAuth2 tambahan.")
+        log.info("Nyoba upload menyang Google Drive...")
+        log.warning("Fitur Google Drive upload butuh konfigurasi OAuth2 tambahan.")
         print(f"File lokal tersedia ing: {jalur_file}")
         
         print("Kanggo upload manual menyang Google Drive:")
@@ -394,23 +578,9 @@ def upload_menyang_googledrive(jalur_file: str):
         print(f"3. Pilih file: {jalur_file}")
         
     except Exception as e:
-        print(f"SALAH: Upload Google Drive gagal: {e}")
+        log.error("Upload Google Drive gagal: %s", e)
 
-def utama():
-    wektu_mulai = time.time()
-    print("=" * 80)
-    print("Generator Dataset Strategy Trading - Versi Ngapak")
-    print("Mung kanggo keperluan edukasi lan riset")
-    print(f"Model: {JENENG_MODEL}")
-    print("-" * 80)
-    
-    print(f"INFO: Target Dataset: {UKURAN_DATASET} item strategy trading")
-    print(f"INFO: Direktori Output: {DIREKTORI_OUTPUT}")
-    print(f"INFO: Ukuran Batch: {UKURAN_BATCH}")
-    print(f"INFO: Jumlah Pekerja: {JUMLAH_PEKERJA}")
-    print(f"INFO: Winrate Minimal: 70%")
-    print("-" * 80)
-    
+async def mlakuno_kabeh_pekerja() -> List[Dict[str, Any]]:
     kabeh_data_akumulasi = []
     
     if JUMLAH_PEKERJA > 1:
@@ -424,38 +594,95 @@ def utama():
                 tugas_pekerja.append((i + 1, jumlah_item, UKURAN_BATCH))
         
         if tugas_pekerja:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=JUMLAH_PEKERJA) as executor:
-                future_pekerja = {executor.submit(pekerja_gawe_data, *tugas): tugas[0] for tugas in tugas_pekerja}
-                
-                for future in tqdm(concurrent.futures.as_completed(future_pekerja), total=len(future_pekerja), desc="Progress Pekerja"):
-                    id_pekerja = future_pekerja[future]
-                    try:
-                        hasil_pekerja = future.result()
-                        kabeh_data_akumulasi.extend(hasil_pekerja)
-                        print(f"INFO: Pekerja {id_pekerja} rampung, ngasilno {len(hasil_pekerja)} item.")
-                    except Exception as exc:
-                        print(f'SALAH: Pekerja {id_pekerja} ngasilno exception: {exc}')
+            with tqdm(total=len(tugas_pekerja), desc="Progress Pekerja") as progres:
+                task_pekerja = [asyncio.ensure_future(pekerja_gawe_data(*tugas, kabeh_data_akumulasi)) for tugas in tugas_pekerja]
+                for task in task_pekerja:
+                    task.add_done_callback(lambda _: progres.update(1))
+                kabeh_hasil = await asyncio.gather(*task_pekerja, return_exceptions=True)
+            
+            for tugas, hasil_pekerja in zip(tugas_pekerja, kabeh_hasil):
+                id_pekerja = tugas[0]
+                if isinstance(hasil_pekerja, BaseException):
+                    log.error("Pekerja %s ngasilno exception: %s", id_pekerja, hasil_pekerja)
+                    continue
+                log.info("Pekerja %s rampung, ngasilno %s item.", id_pekerja, hasil_pekerja)
     else:
         if UKURAN_DATASET > 0:
-            print("INFO: Mlaku ing mode pekerja tunggal.")
+            log.info("Mlaku ing mode pekerja tunggal.")
             try:
-                hasil_pekerja = pekerja_gawe_data(1, UKURAN_DATASET, UKURAN_BATCH)
-                kabeh_data_akumulasi.extend(hasil_pekerja)
+                await pekerja_gawe_data(1, UKURAN_DATASET, UKURAN_BATCH, kabeh_data_akumulasi)
             except Exception as exc:
-                print(f'SALAH: Pekerja tunggal ngasilno exception: {exc}')
+                log.error("Pekerja tunggal ngasilno exception: %s", exc)
+    
+    return kabeh_data_akumulasi
+
+async def mlakuno_generasi() -> List[Dict[str, Any]]:
+    global KLIEN, SEMAFOR_API, LIMITER_API
+    try:
+        klien = gawe_klien_together()
+    except Exception as e:
+        log.critical("Gagal nggawe klien Together: %s", e)
+        raise
+    
+    async with klien:
+        KLIEN = klien
+        SEMAFOR_API = asyncio.Semaphore(BATES_PANGGILAN_API)
+        LIMITER_API = AsyncLimiter(MAKS_PANGGILAN_PER_DETIK, 1)
+        try:
+            return await mlakuno_kabeh_pekerja()
+        finally:
+            KLIEN = None
+            SEMAFOR_API = None
+            LIMITER_API = None
+
+def mlakuno_async(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    hasil = {}
+    def _mlaku():
+        try:
+            hasil['nilai'] = asyncio.run(coro)
+        except BaseException as e:
+            hasil['salah'] = e
+    thread = threading.Thread(target=_mlaku)
+    thread.start()
+    thread.join()
+    if 'salah' in hasil:
+        raise hasil['salah']
+    return hasil['nilai']
+
+def utama():
+    wektu_mulai = time.time()
+    print("=" * 80)
+    print("Generator Dataset Strategy Trading - Versi Ngapak")
+    print("Mung kanggo keperluan edukasi lan riset")
+    print(f"Model: {JENENG_MODEL}")
+    print("-" * 80)
+    
+    log.info("Target Dataset: %s item strategy trading", UKURAN_DATASET)
+    log.info("Direktori Output: %s", DIREKTORI_OUTPUT)
+    log.info("Ukuran Batch: %s", UKURAN_BATCH)
+    log.info("Jumlah Pekerja: %s", JUMLAH_PEKERJA)
+    log.info("Winrate Minimal: 70%")
+    print("-" * 80)
+    
+    kabeh_data_akumulasi = mlakuno_async(mlakuno_generasi())
     
-    print(f"\nINFO: Kabeh proses generasi data wis rampung.")
+    log.info("Kabeh proses generasi data wis rampung. Total item digawe: %s", len(kabeh_data_akumulasi))
     
     if UKURAN_DATASET > 0:
-        data_final, jalur_file_final = gabung_file_data()
-        print(f"INFO: Total item unik sawise penggabungan: {len(data_final) if data_final else 0}")
+        data_final, jalur_file_final = gabung_file_data(kabeh_data_akumulasi or None)
+        log.info("Total item unik sawise penggabungan: %s", len(data_final) if data_final else 0)
         
         if data_final and len(data_final) > 0:
             upload_menyang_googledrive(str(jalur_file_final))
         else:
-            print("INFO: Ora ana data valid kanggo diupload menyang Google Drive.")
+            log.info("Ora ana data valid kanggo diupload menyang Google Drive.")
     else:
-        print("INFO: UKURAN_DATASET 0, ora ana data sing digawe.")
+        log.info("UKURAN_DATASET 0, ora ana data sing digawe.")
     
     wektu_pungkas = time.time()
     total_wektu = wektu_pungkas - wektu_mulai